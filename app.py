@@ -3,6 +3,7 @@ from urllib.request import urlopen
 
 import dash
 import dash_daq as daq
+import dash_leaflet as dl
 import dash_bootstrap_components as dbc
 import dash_core_components as dcc
 import dash_html_components as html
@@ -14,8 +15,11 @@ import os
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objs as go
-from dash.dependencies import Input, Output
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from flask import Response, abort
 from flask.helpers import get_root_path
+from profiling import init_profiling
+from tiles import TileCache, colorscale_lut, project, render_tile
 print(get_root_path(__name__))
 
 # Get relative data paths
@@ -42,7 +46,39 @@ df_plants = df_plants.reset_index(drop=True)
 df_plants.insert(loc=0, column='id', value=np.arange(len(df_plants)))
 
 # Set mapbox access token
-px.set_mapbox_access_token("pk.eyJ1IjoiYmlnZG9nZGF0YSIsImEiOiJja3FiYnd2MWcwaDF1Mm9rZDhpNGVqc2gzIn0.XeBuYQMlGHgu4ml4R4RtRQ")
+mapbox_access_token = "pk.eyJ1IjoiYmlnZG9nZGF0YSIsImEiOiJja3FiYnd2MWcwaDF1Mm9rZDhpNGVqc2gzIn0.XeBuYQMlGHgu4ml4R4RtRQ"
+mapbox_tile_url = 'https://api.mapbox.com/styles/v1/bigdogdata/ckqreebqs3s2b17rygkmnnyhy/draft/tiles/256/{z}/{x}/{y}@2x?access_token=' + mapbox_access_token
+
+# Zip zone points projected once for tile rendering
+zone_mx, zone_my = project(df['latitude'].to_numpy(), df['longitude'].to_numpy())
+zone_min_temp = df['min_temp'].to_numpy()
+zone_lut = colorscale_lut(px.colors.sequential.haline)
+zone_range = (-55, 65)
+# Bump when the tile colours, range or point style change so cached tiles are not reused
+zone_tiles_version = 1
+zone_tiles_path = 'tiles/v{}/'.format(zone_tiles_version)
+tile_cache = TileCache(
+    os.environ.get('TILE_CACHE_DIR', os.path.join(this_directory, 'tile_cache')),
+    version=zone_tiles_version
+)
+
+# Thresholds outside the zone temperatures all render the same tiles
+zone_temp_bounds = (int(zone_min_temp.min()), int(zone_min_temp.max()) + 1)
+
+# Colour legend for the zone tiles
+zone_legend_gradient = 'linear-gradient(to right, {})'.format(', '.join(
+    'rgb({}, {}, {}) {}%'.format(*zone_lut[int(i * (len(zone_lut) - 1) / 10)], i * 10) for i in range(11)
+))
+
+# Plant image urls
+image_url_1 = 'https://plants.sc.egov.usda.gov/ImageLibrary/standard/'
+image_url_2 = '_001_svp.jpg'
+no_image_url = 'https://upload.wikimedia.org/wikipedia/commons/thumb/6/65/No-Image-Placeholder.svg/1200px-No-Image-Placeholder.svg.png'
+
+# Columns shown in the plant detail tables
+characteristics_columns = ['family_common_name', 'category', 'species']
+growth_columns = ['temperature_minimum_f', 'growth_habit', 'growth_rate', 'height_mature_feet', 'lifespan', 'toxicity']
+reproduction_columns = ['bloom_period', 'fruit_seed_period_begin', 'fruit_seed_period_end', 'fruit_seed_abundance']
 
 # Style settings
 colors = {
@@ -62,6 +98,181 @@ app = dash.Dash(
 app.title = 'Plant Viewer'
 server = app.server
 
+# Opt-in callback profiling, stored under profiles/ and listed at /_profiles when PROFILE_TOKEN is set
+init_profiling(
+    app,
+    os.environ.get('PROFILE_DIR', os.path.join(this_directory, 'profiles')),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+    token=os.environ.get('PROFILE_TOKEN'),
+    max_profiles=int(os.environ.get('PROFILE_MAX_FILES', 50))
+)
+
+# Zone map tiles for zips at or above a minimum temperature
+def clamp_zone_temp(selected_temp):
+    return min(max(int(selected_temp), zone_temp_bounds[0]), zone_temp_bounds[1])
+
+def get_tiles_url(selected_temp):
+    return app.get_relative_path('/' + zone_tiles_path + '{}/{{z}}/{{x}}/{{y}}.png'.format(clamp_zone_temp(selected_temp)))
+
+# Settings used to build plant details on the client from the table rows
+prefetch_config = {
+    'image_url_1': image_url_1,
+    'image_url_2': image_url_2,
+    'no_image_url': no_image_url,
+    'tiles_url': app.get_relative_path('/' + zone_tiles_path + '{temp}/{z}/{x}/{y}.png'),
+    'zone_temp_bounds': zone_temp_bounds,
+    'characteristics_columns': characteristics_columns,
+    'growth_columns': growth_columns,
+    'reproduction_columns': reproduction_columns,
+}
+
+# Plant detail tables, filled from the selected plant's details
+def detail_tables():
+    return [
+        # Characteristics table
+        html.Div(
+            [
+                dash_table.DataTable(
+                    id='table-characteristics',
+                    columns=[{'name': ['Characteristics', i], 'id': i} for i in ['index', 'value']],
+                    style_header={
+                        'backgroundColor': 'rgb(30, 30, 30)', 
+                        'border': 'none', 
+                        'textAlign': 'center'
+                        },
+                    style_header_conditional=[
+                        {
+                            'if': {'header_index': 1},
+                            'display': 'none'
+                        }
+                    ],
+                    style_cell={
+                        'backgroundColor': colors['background'],
+                        'color': colors['text'],
+                        'textAlign': 'left',
+                        'overflow': 'hidden',
+                        'textOverflow': 'ellipsis',
+                        'width': '50%'
+                    },
+                    style_data_conditional=[                
+                        {
+                            'if': {'state': 'active'},
+                            'backgroundColor': '#525F89',
+                            'border': '#FFFFF'                                 
+                        },
+                        {
+                            'if': {'column_id': 'index'},
+                            'textAlign': 'left',
+                        }
+                    ],
+                    merge_duplicate_headers=True,
+                    style_as_list_view=True,
+                    css=[
+                        {
+                            'selector': 'tr:hover', 
+                            'rule': 'background-color: #525F89;'
+                        }
+                    ],
+                ),
+            ],
+        ),
+        # Growth Table
+        html.Div(
+            [
+                dash_table.DataTable(
+                    id='table-growth',
+                    columns=[{'name': ['Growth Requirements', i], 'id': i} for i in ['index', 'value']],
+                    style_header={
+                        'backgroundColor': 'rgb(30, 30, 30)', 
+                        'border': 'none', 
+                        'textAlign': 'center'
+                        },
+                    style_header_conditional=[
+                        {
+                            'if': {'header_index': 1},
+                            'display': 'none'
+                        }
+                    ],
+                    style_cell={
+                        'backgroundColor': colors['background'],
+                        'color': colors['text'],
+                        'textAlign': 'left',
+                        'overflow': 'hidden',
+                        'textOverflow': 'ellipsis',
+                        'width': '50%'
+                    },
+                    style_data_conditional=[                
+                        {
+                            'if': {'state': 'active'},
+                            'backgroundColor': '#525F89',
+                            'border': '#FFFFF'                              
+                        },
+                        {
+                            'if': {'column_id': 'index'},
+                            'textAlign': 'left',
+                        }
+                    ],
+                    merge_duplicate_headers=True,
+                    style_as_list_view=True,
+                    css=[
+                        {
+                            'selector': 'tr:hover', 
+                            'rule': 'background-color: #525F89'
+                        },
+                    ],
+                ),
+            ],
+        ),
+        # Reproduction Table
+        html.Div(
+            [
+                dash_table.DataTable(
+                    id='table-reproduction',
+                    columns=[{'name': ['Reproduction', i], 'id': i} for i in ['index', 'value']],
+                    style_table={'width': '100%'},
+                    style_header={
+                        'backgroundColor': 'rgb(30, 30, 30)', 
+                        'border': 'none', 
+                        'textAlign': 'center'
+                        },
+                    style_header_conditional=[
+                        {
+                            'if': {'header_index': 1},
+                            'display': 'none'
+                        }
+                    ],
+                    style_cell={
+                        'backgroundColor': colors['background'],
+                        'color': colors['text'],
+                        'textAlign': 'left',
+                        'overflow': 'hidden',
+                        'textOverflow': 'ellipsis',
+                        'width': '50%'
+                    },
+                    style_data_conditional=[                
+                        {
+                            'if': {'state': 'active'},
+                            'backgroundColor': '#525F89',
+                            'border': '#FFFFF'                             
+                        },
+                        {
+                            'if': {'column_id': 'index'},
+                            'textAlign': 'left',
+                        }
+                    ],
+                    merge_duplicate_headers=True,
+                    style_as_list_view=True,
+                    css=[
+                        {
+                            'selector': 'tr:hover', 
+                            'rule': 'background-color: #525F89'
+                        },
+                    ],
+                ),
+            ],
+        ),
+    ]
+
 # App layout
 app.layout = html.Div(
     [
@@ -244,18 +455,49 @@ app.layout = html.Div(
                             className='imagebox'
                         ),
                         dcc.Loading(
-                            html.Div(id='table-characteristics-div'),
+                            html.Div(id='table-characteristics-div', children=detail_tables()),
                             type="cube"
                         ),
+                        dcc.Store(id='prefetch-config', data=prefetch_config),
+                        dcc.Store(id='page-prefetch'),
+                        dcc.Store(id='selected-plant-id'),
+                        dcc.Store(id='plant-details-request'),
+                        dcc.Store(id='plant-details'),
+                        html.Div(id='prefetch-images', style={'display': 'none'}),
                     ],
                     id='middle-column',
                     className='pretty_container two columns'                   
                 ),
                 html.Div(
                     [
-                        dcc.Loading(
-                            children=[dcc.Graph(id='plants-map')],
-                            type="cube"
+                        html.Div(
+                            [
+                                html.Label('Min. Temp', className='control_label'),
+                                html.Div(style={'background': zone_legend_gradient, 'height': '12px'}),
+                                html.Div(
+                                    [
+                                        html.Span('{}°F'.format(zone_range[0])),
+                                        html.Span('{}°F'.format(zone_range[1])),
+                                    ],
+                                    style={'display': 'flex', 'justifyContent': 'space-between'}
+                                ),
+                            ],
+                            id='zone-legend',
+                            style={'margin': '0 30px 10px 30px'}
+                        ),
+                        dl.Map(
+                            id='plants-map',
+                            center=[39.5, -110],
+                            zoom=4,
+                            children=[
+                                dl.TileLayer(url=mapbox_tile_url),
+                                dl.TileLayer(
+                                    id='zone-tiles',
+                                    url=get_tiles_url(zone_min_temp.min())
+                                ),
+                                dl.LayerGroup(id='zip-popup'),
+                            ],
+                            style={'height': '1000px', 'margin': '0 30px 20px 30px'}
                         ),
                     ], 
                     id='right-column',
@@ -269,17 +511,32 @@ app.layout = html.Div(
 )
 
 # Helper Functions
-def filter_df_plants(selected_plant):
+def get_plant_temp(selected_plant):
     df_plants_filtered = df_plants[df_plants['common_name']==selected_plant]
-    selected_temp = df_plants_filtered['temperature_minimum_f'].max()
+    return df_plants_filtered['temperature_minimum_f'].max()
+
+def filter_df_plants(selected_plant):
+    selected_temp = get_plant_temp(selected_plant)
     filtered_df = df[df['min_temp'] >= selected_temp]
     return filtered_df
 
-def get_image_url(selected_plant):
-    url_1 = 'https://plants.sc.egov.usda.gov/ImageLibrary/standard/'
-    url_2 = '_001_svp.jpg'
-    symbol = df_plants[df_plants['common_name']==selected_plant]['symbol'].to_string(index=False)
-    return (url_1 + symbol + url_2)
+def get_image_url(plant):
+    if plant['has_image'] > 0:
+        return image_url_1 + plant['symbol'] + image_url_2
+    return no_image_url
+
+def get_plant_details(plant_id):
+    plant = df_plants.loc[plant_id]
+    return {
+        'id': int(plant_id),
+        'common_name': plant['common_name'],
+        'image_url': get_image_url(plant),
+        'min_temp': int(plant['temperature_minimum_f']),
+        'tiles_url': get_tiles_url(plant['temperature_minimum_f']),
+        'characteristics': [{'index': i, 'value': plant[i]} for i in characteristics_columns],
+        'growth': [{'index': i, 'value': plant[i]} for i in growth_columns],
+        'reproduction': [{'index': i, 'value': plant[i]} for i in reproduction_columns],
+    }
 
 def filter_by_zip(selected_df, selected_zip):
     min_temp = df[df['zipcode'] == selected_zip]['min_temp'].item()
@@ -301,67 +558,99 @@ def filter_by_growth_habit(selected_df, growth_habit_list):
         selected_df = selected_df[selected_df['growth_habit'].str.contains(growth_habit, case=False, na=False)]
     return selected_df
 
-def transpose_classification(selected_df, selected_plant):
-    df_transposed = selected_df
-    plant_id = df_transposed[df_transposed['common_name'] == selected_plant]['id']
-    df_transposed = df_transposed.drop('common_name', 1)
-    df_transposed = df_transposed.set_index('id').transpose()
-    df_transposed = df_transposed.reset_index()
-    df_transposed = df_transposed[['index', int(plant_id)]]
-    return df_transposed
+# Serve zip zone tiles colored by min_temp, masked by the plant's minimum temperature
+@server.route(app.config.routes_pathname_prefix + zone_tiles_path + '<int(signed=True):temp>/<int:z>/<int:x>/<int:y>.png')
+def zone_tile(temp, z, x, y):
+    if not 0 <= z <= 18 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+        abort(404)
+    temp = clamp_zone_temp(temp)
+    key = (temp, z, x, y)
+    png = tile_cache.get(key)
+    if png is None:
+        mask = zone_min_temp >= temp
+        png = render_tile(zone_mx[mask], zone_my[mask], zone_min_temp[mask], zone_lut, zone_range, z, x, y)
+        tile_cache.put(key, png)
+    response = Response(png, mimetype='image/png')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+# Build details of the plants on the visible table page from the table data
+app.clientside_callback(
+    ClientsideFunction(namespace='prefetch', function_name='build_page'),
+    Output('page-prefetch', 'data'),
+    Input('table-paging-and-sorting', 'derived_viewport_row_ids'),
+    State('table-paging-and-sorting', 'data'),
+    State('prefetch-config', 'data')
+)
+
+# Warm the browser image cache for the prefetched page
+app.clientside_callback(
+    ClientsideFunction(namespace='prefetch', function_name='warm_images'),
+    Output('prefetch-images', 'children'),
+    Input('page-prefetch', 'data')
+)
+
+# Request details from the server only for plants that were not prefetched
+app.clientside_callback(
+    ClientsideFunction(namespace='prefetch', function_name='request_details'),
+    Output('plant-details-request', 'data'),
+    Input('common-dropdown', 'value'),
+    State('page-prefetch', 'data'),
+    State('selected-plant-id', 'data')
+)
 
-# Update map with dropdown
 @app.callback(
-    Output('plants-map', 'figure'),
-    Input('common-dropdown', 'value')
+    Output('plant-details', 'data'),
+    Input('plant-details-request', 'data')
 )
-def update_graph(selected_plant):
-    if selected_plant is None:  
+def load_plant_details(selected_plant):
+    if selected_plant is None:
         return dash.no_update
-    if not selected_plant:
-        filtered_df = df
-    else:
-        filtered_df = filter_df_plants(selected_plant)
-
-    fig = px.scatter_mapbox(
-        filtered_df,
-        lat="latitude",
-        lon="longitude",
-        hover_name="city",
-        hover_data=["zone", "zipcode"],
-        color="min_temp",
-        color_continuous_scale=px.colors.sequential.haline,
-        range_color=[-55, 65],
-        center={"lat": 39.5, "lon": -110},
-        zoom=4,
-        opacity=0.8
-    )
+    plant_ids = df_plants.index[df_plants['common_name']==selected_plant]
+    if len(plant_ids) == 0:
+        return dash.no_update
+    return get_plant_details(plant_ids[0])
+
+# Update image, map and detail tables from prefetched or loaded details
+app.clientside_callback(
+    ClientsideFunction(namespace='prefetch', function_name='render_details'),
+    Output('image-url', 'src'),
+    Output('zone-tiles', 'url'),
+    Output('table-characteristics', 'data'),
+    Output('table-growth', 'data'),
+    Output('table-reproduction', 'data'),
+    Input('common-dropdown', 'value'),
+    Input('selected-plant-id', 'data'),
+    Input('page-prefetch', 'data'),
+    Input('plant-details', 'data')
+)
 
-    fig.update_layout(
-        legend_title_text='Min. Temp',
-        mapbox_style="mapbox://styles/bigdogdata/ckqreebqs3s2b17rygkmnnyhy/draft",
-        autosize=True,
-        uirevision='no reset of zoom',
-        margin=dict(l=30, r=30, b=20, t=0),
-        height=1000,
-        plot_bgcolor=colors['background'],
-        paper_bgcolor=colors['background'],
-        legend_bgcolor=colors['background'],
-        font_color=colors['text']
-    )
-    return fig
-  
-# Show zip code on map click
+# Show nearest zip code on map click
 @app.callback(
-    # Output('led-zipcode', 'value'),
     Output('zip-dropdown', 'value'),
-    Input('plants-map', 'clickData')
+    Output('zip-popup', 'children'),
+    Input('plants-map', 'click_lat_lng'),
+    State('common-dropdown', 'value')
     )
-def display_click_data(clickData):
-    if clickData is None:
-        return dash.no_update
-    else:
-        return clickData['points'][0]['customdata'][1]
+def display_click_data(click_lat_lng, selected_plant):
+    if click_lat_lng is None:
+        return dash.no_update, dash.no_update
+    filtered_df = filter_df_plants(selected_plant) if selected_plant else df
+    if filtered_df.empty:
+        return dash.no_update, dash.no_update
+    lat, lon = click_lat_lng
+    distance = (filtered_df['latitude'] - lat) ** 2 + ((filtered_df['longitude'] - lon) * np.cos(np.radians(lat))) ** 2
+    zone = filtered_df.loc[distance.idxmin()]
+    popup = dl.Popup(
+        position=[zone['latitude'], zone['longitude']],
+        children=[
+            html.B('{}, {}'.format(zone['city'].title(), zone['state'])),
+            html.Div('Zip code: {:05d}'.format(zone['zipcode'])),
+            html.Div('Zone: {}'.format(zone['zone'])),
+            html.Div('Min. Temp: {}°F'.format(zone['min_temp'])),
+        ]
+    )
+    return zone['zipcode'], [popup]
 
 # Zipcode dropdown updates temperature slider
 @app.callback(
@@ -410,201 +699,15 @@ def update_table(selected_zip, duration_list, image_selected_list, selected_temp
 def display_value(drag_value):
     return 'Filter by Minimum Temperature: {}°F'.format(drag_value)
 
-# Show image on datatable click
-@app.callback(
-    Output("image-url", "src"),
-    Input("common-dropdown", "value"),
-    prevent_initial_call=True
-)
-def cell_clicked(selected_plant):
-    trigger_id = dash.callback_context.triggered[0]["prop_id"]
-    if trigger_id == 'common-dropdown.value':
-        if selected_plant is None:
-            return dash.no_update
-        if df_plants[df_plants['common_name']==selected_plant]['has_image'].item() > 0:
-            return str(get_image_url(selected_plant))
-        return 'https://upload.wikimedia.org/wikipedia/commons/thumb/6/65/No-Image-Placeholder.svg/1200px-No-Image-Placeholder.svg.png'
-
-# Update characteristics
-@app.callback(
-    Output('table-characteristics-div', 'children'),
-    Input("common-dropdown", "value")
-)
-def update_table(selected_plant):
-    if selected_plant is None:
-        return dash.no_update
-    df_characteristics = df_plants[['id', 'common_name', 'family_common_name', 'category', 'species']]
-    data_characteristics = transpose_classification(df_characteristics, selected_plant)
-    dict_chracteristics = data_characteristics.to_dict('records')
-
-    df_growth = df_plants[['id', 'common_name', 'temperature_minimum_f', 'growth_habit', 'growth_rate', 'height_mature_feet', 'lifespan', 'toxicity']]
-    data_growth = transpose_classification(df_growth, selected_plant)
-    dict_growth = data_growth.to_dict('records')
-
-    df_reproduction = df_plants[['id', 'common_name', 'bloom_period', 'fruit_seed_period_begin', 'fruit_seed_period_end', 'fruit_seed_abundance']]
-    data_reproduction = transpose_classification(df_reproduction, selected_plant)
-    dict_reproduction = data_reproduction.to_dict('records')
-
-    return [
-        # Update characteristics table
-        html.Div(
-            [
-                dash_table.DataTable(
-                    id='table-characteristics',
-                    columns=[{'name': ['Characteristics', str(i)], 'id': str(i)} for i in data_characteristics.columns],
-                    data=dict_chracteristics,
-                    style_header={
-                        'backgroundColor': 'rgb(30, 30, 30)', 
-                        'border': 'none', 
-                        'textAlign': 'center'
-                        },
-                    style_header_conditional=[
-                        {
-                            'if': {'header_index': 1},
-                            'display': 'none'
-                        }
-                    ],
-                    style_cell={
-                        'backgroundColor': colors['background'],
-                        'color': colors['text'],
-                        'textAlign': 'left',
-                        'overflow': 'hidden',
-                        'textOverflow': 'ellipsis',
-                        'width': '50%'
-                    },
-                    style_data_conditional=[                
-                        {
-                            'if': {'state': 'active'},
-                            'backgroundColor': '#525F89',
-                            'border': '#FFFFF'                                 
-                        },
-                        {
-                            'if': {'column_id': 'index'},
-                            'textAlign': 'left',
-                        }
-                    ],
-                    merge_duplicate_headers=True,
-                    style_as_list_view=True,
-                    css=[
-                        {
-                            'selector': 'tr:hover', 
-                            'rule': 'background-color: #525F89;'
-                        }
-                    ],
-                ),
-            ],
-        ),
-        # Update growth Table
-        html.Div(
-            [
-                dash_table.DataTable(
-                    id='table-growth',
-                    columns=[{'name': ['Growth Requirements', str(i)], 'id': str(i)} for i in data_growth.columns],
-                    data=dict_growth,
-                    style_header={
-                        'backgroundColor': 'rgb(30, 30, 30)', 
-                        'border': 'none', 
-                        'textAlign': 'center'
-                        },
-                    style_header_conditional=[
-                        {
-                            'if': {'header_index': 1},
-                            'display': 'none'
-                        }
-                    ],
-                    style_cell={
-                        'backgroundColor': colors['background'],
-                        'color': colors['text'],
-                        'textAlign': 'left',
-                        'overflow': 'hidden',
-                        'textOverflow': 'ellipsis',
-                        'width': '50%'
-                    },
-                    style_data_conditional=[                
-                        {
-                            'if': {'state': 'active'},
-                            'backgroundColor': '#525F89',
-                            'border': '#FFFFF'                              
-                        },
-                        {
-                            'if': {'column_id': 'index'},
-                            'textAlign': 'left',
-                        }
-                    ],
-                    merge_duplicate_headers=True,
-                    style_as_list_view=True,
-                    css=[
-                        {
-                            'selector': 'tr:hover', 
-                            'rule': 'background-color: #525F89'
-                        },
-                    ],
-                ),
-            ],
-        ),
-        # Update reproduction Table
-        html.Div(
-            [
-                dash_table.DataTable(
-                    id='table-reproduction',
-                    columns=[{'name': ['Reproduction', str(i)], 'id': str(i)} for i in data_reproduction.columns],
-                    data=dict_reproduction,
-                    style_table={'width': '100%'},
-                    style_header={
-                        'backgroundColor': 'rgb(30, 30, 30)', 
-                        'border': 'none', 
-                        'textAlign': 'center'
-                        },
-                    style_header_conditional=[
-                        {
-                            'if': {'header_index': 1},
-                            'display': 'none'
-                        }
-                    ],
-                    style_cell={
-                        'backgroundColor': colors['background'],
-                        'color': colors['text'],
-                        'textAlign': 'left',
-                        'overflow': 'hidden',
-                        'textOverflow': 'ellipsis',
-                        'width': '50%'
-                    },
-                    style_data_conditional=[                
-                        {
-                            'if': {'state': 'active'},
-                            'backgroundColor': '#525F89',
-                            'border': '#FFFFF'                             
-                        },
-                        {
-                            'if': {'column_id': 'index'},
-                            'textAlign': 'left',
-                        }
-                    ],
-                    merge_duplicate_headers=True,
-                    style_as_list_view=True,
-                    css=[
-                        {
-                            'selector': 'tr:hover', 
-                            'rule': 'background-color: #525F89'
-                        },
-                    ],
-                ),
-            ],
-        ),
-    ]
-
 # Add value to common/scientific dropdown when datatable is clicked
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='prefetch', function_name='update_dropdown'),
     Output('common-dropdown', 'value'), 
+    Output('selected-plant-id', 'data'),
     Input("table-paging-and-sorting", "active_cell"),
+    State("table-paging-and-sorting", "data"),
     prevent_initial_call=True
 )
-def update_dropdown(active_cell):
-    if active_cell is None:
-        return dash.no_update
-    row_id = active_cell["row_id"]
-    selected_plant = df_plants.at[row_id, 'common_name']
-    return selected_plant
 
 # Sync scientific and common dropdowns
 @app.callback(
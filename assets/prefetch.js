@@ -0,0 +1,104 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    prefetch: {
+        clamp_temp: function(temp, bounds) {
+            return Math.min(Math.max(Math.trunc(temp), bounds[0]), bounds[1]);
+        },
+
+        // Same shape as get_plant_details in app.py, built from a table row
+        plant_details: function(row, config) {
+            var rows = function(columns) {
+                return columns.map(function(column) {
+                    return {'index': column, 'value': row[column]};
+                });
+            };
+            var temp = window.dash_clientside.prefetch.clamp_temp(row.temperature_minimum_f, config.zone_temp_bounds);
+            return {
+                'id': row.id,
+                'common_name': row.common_name,
+                'image_url': row.has_image > 0 ? config.image_url_1 + row.symbol + config.image_url_2 : config.no_image_url,
+                'min_temp': row.temperature_minimum_f,
+                'tiles_url': config.tiles_url.replace('{temp}', temp),
+                'characteristics': rows(config.characteristics_columns),
+                'growth': rows(config.growth_columns),
+                'reproduction': rows(config.reproduction_columns)
+            };
+        },
+
+        // Find a plant's details in the prefetched page, preferring the clicked row
+        find_details: function(page, plant, plant_id) {
+            if (!page || plant === null || plant === undefined) {
+                return null;
+            }
+            var match = null;
+            for (var i = 0; i < page.length; i++) {
+                if (page[i].common_name !== plant) {
+                    continue;
+                }
+                if (page[i].id === plant_id) {
+                    return page[i];
+                }
+                match = match || page[i];
+            }
+            return match;
+        },
+
+        build_page: function(row_ids, data, config) {
+            if (!row_ids || !data) {
+                return [];
+            }
+            var rows_by_id = {};
+            data.forEach(function(row) {
+                rows_by_id[row.id] = row;
+            });
+            return row_ids.filter(function(row_id) {
+                return row_id in rows_by_id;
+            }).map(function(row_id) {
+                return window.dash_clientside.prefetch.plant_details(rows_by_id[row_id], config);
+            });
+        },
+
+        warm_images: function(page) {
+            if (page) {
+                window.prefetchImages = page.map(function(details) {
+                    var image = new Image();
+                    image.src = details.image_url;
+                    return image;
+                });
+            }
+            return window.dash_clientside.no_update;
+        },
+
+        request_details: function(plant, page, plant_id) {
+            if (plant === null || plant === undefined || window.dash_clientside.prefetch.find_details(page, plant, plant_id)) {
+                return window.dash_clientside.no_update;
+            }
+            return plant;
+        },
+
+        render_details: function(plant, plant_id, page, loaded) {
+            var details = window.dash_clientside.prefetch.find_details(page, plant, plant_id);
+            if (!details && loaded && loaded.common_name === plant) {
+                details = loaded;
+            }
+            if (!details) {
+                var no_update = window.dash_clientside.no_update;
+                return [no_update, no_update, no_update, no_update, no_update];
+            }
+            return [details.image_url, details.tiles_url, details.characteristics, details.growth, details.reproduction];
+        },
+
+        // Look up the clicked row in the table data already on the client
+        update_dropdown: function(active_cell, data) {
+            var no_update = window.dash_clientside.no_update;
+            if (!active_cell || !data) {
+                return [no_update, no_update];
+            }
+            for (var i = 0; i < data.length; i++) {
+                if (data[i].id === active_cell.row_id) {
+                    return [data[i].common_name, data[i].id];
+                }
+            }
+            return [no_update, no_update];
+        }
+    }
+});
@@ -0,0 +1,369 @@
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import socket
+import subprocess
+import threading
+import time
+from http.client import HTTPException
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+# Set relative data paths
+this_directory = os.path.dirname(os.path.abspath(__file__))
+src_zip_zones = os.path.join(this_directory, 'data', 'zip_zones.csv')
+src_usda_plants = os.path.join(this_directory, 'data', 'usda_plants_filtered.csv')
+
+# Load data used to build realistic payloads
+df = pd.read_csv(src_zip_zones)
+df_plants = pd.read_csv(src_usda_plants, index_col=0)
+df_plants.columns = df_plants.columns.str.lower()
+
+zip_list = df['zipcode'].tolist()
+zone_min_temp = pd.to_numeric(df['trange'].apply(lambda x: x.split(' ')[0]))
+zone_temp_bounds = (int(zone_min_temp.min()), int(zone_min_temp.max()) + 1)
+scientific_list = df_plants['scientific_name_x'].tolist()
+scientific_to_common = dict(zip(df_plants['scientific_name_x'][::-1], df_plants['common_name'][::-1]))
+duration_options = ['Biennial', 'Annual', 'Perennial']
+growth_habit_options = ['Tree', 'Shrub', 'Forb', 'Herb', 'Graminoid', 'Vine']
+page_size = 25
+
+# Tiles covering the initial map view (center 39.5, -110 at zoom 4, 1000px high)
+map_zoom = 4
+map_x = (-110 + 180) / 360 * 2 ** map_zoom
+map_y = (1 - math.asinh(math.tan(math.radians(39.5))) / math.pi) / 2 * 2 ** map_zoom
+visible_tiles = [
+    (x, y)
+    for x in range(int(map_x) - 1, int(map_x) + 2)
+    for y in range(int(map_y) - 2, int(map_y) + 3)
+]
+
+
+# Send a single callback request the same way the Dash renderer does
+class Session:
+    def __init__(self, base_url, tiles_url, results, lock, rng):
+        self.base_url = base_url
+        self.tiles_url = tiles_url
+        self.results = results
+        self.lock = lock
+        self.rng = rng
+        self.state = {
+            'zip-dropdown.value': 92620,
+            'slider-temperature.value': -70,
+            'slider-temperature.drag_value': -70,
+            'checklist-duration.value': None,
+            'checklist-image.on': True,
+            'dropdown-growth-habit.value': None,
+        }
+        self.table_data = []
+
+    def callback(self, output, inputs, changed):
+        component_id, prop = output.split('.')
+        payload = {
+            'output': output,
+            'outputs': {'id': component_id, 'property': prop},
+            'inputs': [
+                {'id': i.split('.')[0], 'property': i.split('.')[1], 'value': value}
+                for i, value in inputs
+            ],
+            'changedPropIds': changed,
+            'state': [],
+        }
+        request = Request(
+            self.base_url + '/_dash-update-component',
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+        )
+        start = time.perf_counter()
+        value = None
+        body = None
+        try:
+            with urlopen(request, timeout=60) as response:
+                status = response.status
+                body = response.read()
+        except (OSError, HTTPException) as e:
+            status = getattr(e, 'code', None)
+        # Stop the clock before parsing so client-side JSON work is not counted
+        elapsed = time.perf_counter() - start
+        if body:
+            try:
+                value = json.loads(body)['response'].get(component_id, {}).get(prop)
+            except (ValueError, KeyError, AttributeError):
+                # Count broken responses as failures instead of ending the session
+                status = None
+        # 204 is returned when a callback raises PreventUpdate or returns no_update
+        with self.lock:
+            self.results.setdefault(output, []).append((elapsed, status in (200, 204)))
+        return value
+
+    def fetch_tiles(self, url):
+        for x, y in visible_tiles:
+            start = time.perf_counter()
+            try:
+                with urlopen(self.base_url + url.format(z=map_zoom, x=x, y=y), timeout=60) as response:
+                    response.read()
+                    status = response.status
+            except (OSError, HTTPException) as e:
+                status = getattr(e, 'code', None)
+            with self.lock:
+                self.results.setdefault('tiles', []).append((time.perf_counter() - start, status == 200))
+
+    def refresh_table(self, changed):
+        data = self.callback(
+            'table-paging-and-sorting.data',
+            [
+                ('zip-dropdown.value', self.state['zip-dropdown.value']),
+                ('checklist-duration.value', self.state['checklist-duration.value']),
+                ('checklist-image.on', self.state['checklist-image.on']),
+                ('slider-temperature.drag_value', self.state['slider-temperature.drag_value']),
+                ('dropdown-growth-habit.value', self.state['dropdown-growth-habit.value']),
+            ],
+            [changed],
+        )
+        if data is not None:
+            self.table_data = data
+
+    def pick_zip(self):
+        self.state['zip-dropdown.value'] = self.rng.choice(zip_list)
+        value = self.callback(
+            'slider-temperature.value',
+            [
+                ('zip-dropdown.value', self.state['zip-dropdown.value']),
+                ('slider-temperature.value', self.state['slider-temperature.value']),
+            ],
+            ['zip-dropdown.value'],
+        )
+        if value is not None:
+            self.state['slider-temperature.value'] = value
+            self.state['slider-temperature.drag_value'] = value
+        self.refresh_table('zip-dropdown.value')
+
+    def drag_slider(self):
+        # A drag fires drag_value several times before the final value
+        target = self.rng.randint(-70, self.state['slider-temperature.value'])
+        start = self.state['slider-temperature.drag_value']
+        for step in range(1, 5):
+            drag_value = round(start + (target - start) * step / 4)
+            self.state['slider-temperature.drag_value'] = drag_value
+            self.callback(
+                'slider-temperature-output.children',
+                [('slider-temperature.drag_value', drag_value)],
+                ['slider-temperature.drag_value'],
+            )
+            self.refresh_table('slider-temperature.drag_value')
+        self.state['slider-temperature.value'] = target
+        self.callback(
+            'slider-temperature.value',
+            [
+                ('zip-dropdown.value', self.state['zip-dropdown.value']),
+                ('slider-temperature.value', target),
+            ],
+            ['slider-temperature.value'],
+        )
+
+    def toggle_filters(self):
+        choice = self.rng.randrange(3)
+        if choice == 0:
+            self.state['checklist-duration.value'] = self.rng.sample(duration_options, self.rng.randint(0, 2))
+            self.refresh_table('checklist-duration.value')
+        elif choice == 1:
+            self.state['checklist-image.on'] = not self.state['checklist-image.on']
+            self.refresh_table('checklist-image.on')
+        else:
+            self.state['dropdown-growth-habit.value'] = self.rng.sample(growth_habit_options, self.rng.randint(0, 2))
+            self.refresh_table('dropdown-growth-habit.value')
+
+    def show_plant(self, common, row=None):
+        # Details are built on the client from rows on the visible page, otherwise loaded from the server
+        if row is None:
+            row = next((r for r in self.table_data[:page_size] if r['common_name'] == common), None)
+        if row is not None:
+            temp = min(max(int(row['temperature_minimum_f']), zone_temp_bounds[0]), zone_temp_bounds[1])
+            self.fetch_tiles(self.tiles_url.replace('{temp}', str(temp)))
+            return
+        details = self.callback(
+            'plant-details.data',
+            [('plant-details-request.data', common)],
+            ['plant-details-request.data'],
+        )
+        if details is not None:
+            self.fetch_tiles(details['tiles_url'])
+
+    def click_row(self):
+        # The clicked row is resolved on the client, only the dropdown sync hits the server
+        page = self.table_data[:page_size]
+        if not page:
+            return
+        row = self.rng.choice(page)
+        common = row['common_name']
+        self.show_plant(common, row)
+        self.callback(
+            'common_scientific_div.children',
+            [('common-dropdown.value', common), ('scientific-dropdown.value', None)],
+            ['common-dropdown.value'],
+        )
+
+    def switch_plant(self):
+        scientific = self.rng.choice(scientific_list)
+        self.callback(
+            'common_scientific_div.children',
+            [('common-dropdown.value', None), ('scientific-dropdown.value', scientific)],
+            ['scientific-dropdown.value'],
+        )
+        self.show_plant(scientific_to_common[scientific])
+
+    def run(self, actions):
+        self.pick_zip()
+        steps = [self.pick_zip, self.drag_slider, self.toggle_filters, self.click_row, self.switch_plant]
+        for _ in range(actions):
+            self.rng.choice(steps)()
+
+
+# Helper Functions
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for_server(base_url, timeout, process):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        # Stop waiting as soon as gunicorn exits, e.g. on an import error
+        if process.poll() is not None:
+            return False
+        try:
+            with urlopen(base_url + '/_dash-layout', timeout=5):
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+def start_server(workers, threads):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            'gunicorn', 'app:server', '--preload',
+            '--bind', '127.0.0.1:{}'.format(port),
+            '--workers', str(workers),
+            '--threads', str(threads),
+            '--timeout', '120',
+            '--log-level', 'warning',
+        ],
+        cwd=this_directory,
+        stdout=subprocess.DEVNULL,
+    )
+    return process, 'http://127.0.0.1:{}'.format(port)
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def percentile(sorted_values, pct):
+    index = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+def find_component(layout, component_id):
+    if isinstance(layout, list):
+        for child in layout:
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    elif isinstance(layout, dict):
+        props = layout.get('props', {})
+        if props.get('id') == component_id:
+            return props
+        return find_component(props.get('children'), component_id)
+    return None
+
+def get_tiles_url(base_url):
+    # Tile urls are versioned by the app, read the template the client uses
+    with urlopen(base_url + '/_dash-layout', timeout=60) as response:
+        layout = json.loads(response.read())
+    return find_component(layout, 'prefetch-config')['data']['tiles_url']
+
+def run_sessions(base_url, sessions, actions, seed):
+    results = {}
+    lock = threading.Lock()
+    tiles_url = get_tiles_url(base_url)
+    threads = [
+        threading.Thread(
+            target=Session(base_url, tiles_url, results, lock, random.Random(seed + i)).run,
+            args=(actions,)
+        )
+        for i in range(sessions)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+def print_report(label, results, wall_time):
+    total = sum(len(samples) for samples in results.values())
+    print('\n{}: {} requests in {:.1f}s ({:.1f} req/s)'.format(label, total, wall_time, total / wall_time))
+    print('{:<40} {:>7} {:>7} {:>9} {:>9} {:>9} {:>9}'.format(
+        'callback', 'count', 'errors', 'p50 ms', 'p95 ms', 'p99 ms', 'req/s'))
+    for output in sorted(results):
+        samples = results[output]
+        latencies = sorted(elapsed for elapsed, _ in samples)
+        errors = sum(1 for _, ok in samples if not ok)
+        print('{:<40} {:>7} {:>7} {:>9.1f} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+            output,
+            len(samples),
+            errors,
+            percentile(latencies, 50) * 1000,
+            percentile(latencies, 95) * 1000,
+            percentile(latencies, 99) * 1000,
+            len(samples) / wall_time,
+        ))
+
+def parse_configs(value):
+    configs = []
+    for item in value.split(','):
+        workers, threads = item.lower().split('x')
+        configs.append((int(workers), int(threads)))
+    return configs
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent Plant Viewer sessions against app:server.')
+    parser.add_argument('--configs', default='1x1,2x4,4x4',
+                        help='comma separated gunicorn WORKERSxTHREADS settings to compare')
+    parser.add_argument('--url', help='use an already running server instead of starting gunicorn')
+    parser.add_argument('--sessions', type=int, default=20, help='concurrent simulated sessions')
+    parser.add_argument('--actions', type=int, default=20, help='interactions per session')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--startup-timeout', type=int, default=120)
+    args = parser.parse_args()
+
+    if args.url:
+        results, wall_time = run_sessions(args.url.rstrip('/'), args.sessions, args.actions, args.seed)
+        print_report(args.url, results, wall_time)
+        return
+
+    for workers, threads in parse_configs(args.configs):
+        label = 'workers={} threads={}'.format(workers, threads)
+        process, base_url = start_server(workers, threads)
+        try:
+            if not wait_for_server(base_url, args.startup_timeout, process):
+                if process.poll() is not None:
+                    print('\n{}: server exited with code {}'.format(label, process.returncode))
+                else:
+                    print('\n{}: server did not start'.format(label))
+                continue
+            # Warm up every worker before measuring
+            run_sessions(base_url, workers * threads, 2, args.seed + 10000)
+            results, wall_time = run_sessions(base_url, args.sessions, args.actions, args.seed)
+            print_report(label, results, wall_time)
+        finally:
+            stop_server(process)
+
+if __name__ == "__main__":
+    main()
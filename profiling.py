@@ -0,0 +1,138 @@
+import cProfile
+import hmac
+import ipaddress
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from flask import abort, jsonify, make_response, request, send_from_directory
+
+profile_header = 'X-Dash-Profile'
+
+
+# Keep the most recent callback profiles on disk, deleting the oldest
+class ProfileStore:
+    def __init__(self, directory, max_profiles=50):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, profiler, callback_id, inputs, duration):
+        safe_id = re.sub(r'[^\w.-]', '_', callback_id).strip('_.')[:80] or 'callback'
+        name = '{}_{}_{}'.format(time.time_ns(), os.getpid(), safe_id)
+        profiler.dump_stats(os.path.join(self.directory, name + '.prof'))
+        metadata = {
+            'name': name + '.prof',
+            'callback': callback_id,
+            'inputs': inputs,
+            'duration_ms': round(duration * 1000, 2),
+            'created': time.time(),
+        }
+        with open(os.path.join(self.directory, name + '.json'), 'w') as f:
+            json.dump(metadata, f)
+        self.prune()
+        return name + '.prof'
+
+    def prune(self):
+        with self.lock:
+            names = sorted(f[:-5] for f in os.listdir(self.directory) if f.endswith('.json'))
+            for name in names[:max(0, len(names) - self.max_profiles)]:
+                for ext in ('.prof', '.json'):
+                    try:
+                        os.remove(os.path.join(self.directory, name + ext))
+                    except OSError:
+                        pass
+
+    def list(self):
+        profiles = []
+        for f in sorted(os.listdir(self.directory), reverse=True):
+            if not f.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, f)) as fp:
+                    profiles.append(json.load(fp))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+
+# Helper Functions
+def is_local_request():
+    try:
+        return ipaddress.ip_address(request.remote_addr).is_loopback
+    except ValueError:
+        return False
+
+def summarize_inputs(body, limit=2000):
+    inputs = json.dumps(body.get('inputs', []) + body.get('state', []), default=str)
+    return inputs if len(inputs) <= limit else inputs[:limit] + '...'
+
+def init_profiling(app, directory, sample_rate=0.0, token=None, max_profiles=50):
+    # Wrap the callback dispatch view; profiling is opt-in per request through
+    # the X-Dash-Profile header (matching token) or sampled at sample_rate
+    if not token and sample_rate <= 0:
+        return None
+    server = app.server
+    store = ProfileStore(directory, max_profiles)
+    endpoint = next(
+        rule.endpoint for rule in server.url_map.iter_rules()
+        if rule.rule.endswith('_dash-update-component')
+    )
+    dispatch = server.view_functions[endpoint]
+
+    def has_token():
+        value = request.headers.get(profile_header)
+        if not token or value is None:
+            return False
+        return hmac.compare_digest(value.encode('utf-8'), token.encode('utf-8'))
+
+    def should_profile():
+        if has_token():
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def can_read_profiles():
+        # A reverse proxy on the same host makes every request look local,
+        # so the token is always required as well
+        return is_local_request() and has_token()
+
+    def profiled_dispatch(*args, **kwargs):
+        if not should_profile():
+            return dispatch(*args, **kwargs)
+        body = request.get_json(silent=True) or {}
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = make_response(dispatch(*args, **kwargs))
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            try:
+                name = store.save(profiler, str(body.get('output', '')), summarize_inputs(body), duration)
+            except OSError:
+                name = None
+        if name is not None:
+            response.headers[profile_header + '-Id'] = name
+        return response
+
+    server.view_functions[endpoint] = profiled_dispatch
+
+    # List and download profiles from the local machine with the token only
+    @server.route(app.config.routes_pathname_prefix + '_profiles')
+    def list_profiles():
+        if not can_read_profiles():
+            abort(404)
+        return jsonify(store.list())
+
+    @server.route(app.config.routes_pathname_prefix + '_profiles/<name>')
+    def download_profile(name):
+        if not can_read_profiles() or not name.endswith('.prof'):
+            abort(404)
+        return send_from_directory(store.directory, name, as_attachment=True)
+
+    return store
@@ -0,0 +1,144 @@
+import os
+import shutil
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+tile_size = 256
+
+
+# Keep rendered tiles in memory and on disk, evicting the least recently used
+class TileCache:
+    def __init__(self, directory, version=1, max_memory_tiles=2048, max_disk_tiles=50000):
+        self.directory = os.path.join(directory, 'v{}'.format(version))
+        self.max_memory_tiles = max_memory_tiles
+        self.max_disk_tiles = max_disk_tiles
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+        # Tiles rendered by other versions are never served again
+        for entry in os.scandir(directory):
+            if entry.is_dir() and entry.name.startswith('v') and entry.path != self.directory:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_file() and entry.name.endswith('.png'):
+                os.remove(entry.path)
+
+    def path(self, key):
+        return os.path.join(self.directory, '{}_{}_{}_{}.png'.format(*key))
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+        try:
+            with open(self.path(key), 'rb') as f:
+                png = f.read()
+        except OSError:
+            return None
+        # Touch the file so disk eviction keeps recently served tiles
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+        self.remember(key, png)
+        return png
+
+    def put(self, key, png):
+        self.remember(key, png)
+        tmp_path = '{}.{}.tmp'.format(self.path(key), os.getpid())
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(png)
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            return
+        with self.lock:
+            self.writes += 1
+            prune = self.writes % 500 == 0
+        if prune:
+            self.prune_disk()
+
+    def remember(self, key, png):
+        with self.lock:
+            self.memory[key] = png
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_memory_tiles:
+                self.memory.popitem(last=False)
+
+    def prune_disk(self):
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith('.png')]
+        except OSError:
+            return
+        if len(entries) <= self.max_disk_tiles:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_disk_tiles]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+# Helper Functions
+def colorscale_lut(colorscale, size=256):
+    # Convert a plotly 'rgb(r, g, b)' colorscale into a lookup table
+    stops = np.array([[float(c) for c in color[color.index('(') + 1:-1].split(',')] for color in colorscale])
+    positions = np.linspace(0, 1, len(stops))
+    samples = np.linspace(0, 1, size)
+    return np.stack([np.interp(samples, positions, stops[:, i]) for i in range(3)], axis=1).astype(np.uint8)
+
+def project(latitude, longitude):
+    # Web Mercator coordinates normalized to [0, 1]
+    lat = np.radians(np.clip(latitude, -85.0511, 85.0511))
+    mx = (np.asarray(longitude) + 180.0) / 360.0
+    my = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0
+    return mx, my
+
+def point_radius(z):
+    return int(min(6, max(1, z - 2)))
+
+def render_tile(mx, my, values, lut, value_range, z, x, y, opacity=0.8):
+    scale = tile_size * 2 ** z
+    radius = point_radius(z)
+    px = mx * scale - x * tile_size
+    py = my * scale - y * tile_size
+    visible = (px >= -radius) & (px < tile_size + radius) & (py >= -radius) & (py < tile_size + radius)
+    px = px[visible].astype(np.int32)
+    py = py[visible].astype(np.int32)
+
+    low, high = value_range
+    index = np.clip((values[visible] - low) / (high - low) * (len(lut) - 1), 0, len(lut) - 1).astype(np.int32)
+    colors = np.empty((len(index), 4), dtype=np.uint8)
+    colors[:, :3] = lut[index]
+    colors[:, 3] = int(255 * opacity)
+
+    image = np.zeros((tile_size, tile_size, 4), dtype=np.uint8)
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            tx = px + dx
+            ty = py + dy
+            inside = (tx >= 0) & (tx < tile_size) & (ty >= 0) & (ty < tile_size)
+            image[ty[inside], tx[inside]] = colors[inside]
+    return encode_png(image)
+
+def encode_png(image):
+    height, width = image.shape[:2]
+    # Each scanline is prefixed with filter type 0
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * 4)
+
+    def chunk(tag, data):
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff)
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)),
+        chunk(b'IEND', b''),
+    ])